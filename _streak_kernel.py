@@ -0,0 +1,42 @@
+"""Optional numba-compiled kernel for the consecutive-day streak scan.
+
+Importing this module pulls in numba and numpy, which is slow; main loads
+it lazily (and only for long histories), falling back to its own paths
+when either dependency is missing. cache=True persists the compiled
+binary next to this file so later CLI invocations skip JIT warmup.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def best_and_current(ords: np.ndarray, today_ord: int) -> "tuple[int, int]":
+    """Best and current streak over a sorted, deduped int32 ordinal array."""
+    best = 1
+    cur = 1
+    for i in range(1, ords.size):
+        if ords[i] - ords[i - 1] == 1:
+            cur += 1
+            if cur > best:
+                best = cur
+        else:
+            cur = 1
+    # Current streak anchored at today, else yesterday: binary-search the
+    # anchor, then walk the run backwards.
+    current = 0
+    for anchor in (today_ord, today_ord - 1):
+        lo = 0
+        hi = ords.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ords[mid] < anchor:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < ords.size and ords[lo] == anchor:
+            current = 1
+            while lo > 0 and ords[lo] - ords[lo - 1] == 1:
+                current += 1
+                lo -= 1
+            break
+    return best, current
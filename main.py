@@ -1,15 +1,40 @@
 from __future__ import annotations
-import argparse
+import bisect
+import functools
 import json
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import SimpleNamespace
+from typing import Dict, List, Any, Iterator, Optional
+import os
 import sys
 
+try:
+    import orjson  # C encoder, ~5-10x faster than stdlib json and emits bytes
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # vectorized streak math for long histories
+except ImportError:
+    np = None
+
+try:
+    import ijson  # streaming parse for count-only passes over task files
+except ImportError:
+    ijson = None
+
+# Below this many days the numpy call overhead outweighs the C-loop win.
+NUMPY_MIN_DAYS = 32
+
+# Window of recent days representable in the membership bitmask (11+ years).
+RECENT_MASK_DAYS = 4096
+
 ROOT = Path(__file__).parent
-DB_FILE = ROOT / "streaks.json"
-DATE_FMT = "%Y-%m-%d"
+DB_FILE = ROOT / "streaks.json"  # legacy monolithic DB, split into tasks/ on first run
+TASKS_DIR = ROOT / "tasks"
+INDEX_FILE = ROOT / "index.json"
 
 # ------------- Models & Storage -------------
 
@@ -17,202 +42,447 @@ DATE_FMT = "%Y-%m-%d"
 class Task:
     name: str
     created_at: str  # ISO
-    done_days: List[str]  # list of YYYY-MM-DD
+    done_days: List[int]  # list of day ordinals (date.toordinal)
 
+@functools.lru_cache(maxsize=1)
 def today_str() -> str:
-    return datetime.now().strftime(DATE_FMT)
-
-def load_db() -> Dict[str, Any]:
+    return date.today().isoformat()
+
+@functools.lru_cache(maxsize=1)
+def today_ord() -> int:
+    return date.today().toordinal()
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    # Write-then-rename so a crash mid-write never leaves a truncated file:
+    # one buffered write() of the full payload, fsync, atomic replace.
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "wb", buffering=1 << 20) as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _task_path(key: str) -> Path:
+    return TASKS_DIR / (key.replace("/", "_") + ".json")
+
+def _migrate_record(raw: Dict[str, Any]) -> None:
+    """One-shot upgrade of legacy YYYY-MM-DD string lists to day ordinals."""
+    days = raw.get("done_days", [])
+    if days and isinstance(days[0], str):
+        raw["done_days"] = sorted({_to_ordinal(s) for s in days})
+
+def _migrate_monolith() -> None:
+    """Split the legacy single-file streaks.json into tasks/<slug>.json files.
+
+    Idempotent and re-runnable: the presence of streaks.json itself marks an
+    unfinished migration (it is renamed to .bak only once every task file and
+    the index are on disk), and existing task files are never overwritten, so
+    a crash mid-split just resumes on the next run without clobbering newer
+    per-task writes.
+    """
     if not DB_FILE.exists():
-        return {"tasks": {}}
+        return
     try:
-        return json.loads(DB_FILE.read_text(encoding="utf-8"))
+        db = _loads(DB_FILE.read_bytes())
     except Exception:
-        return {"tasks": {}}
-
-def save_db(db: Dict[str, Any]) -> None:
-    DB_FILE.write_text(json.dumps(db, indent=2, ensure_ascii=False), encoding="utf-8")
-
-def get_task(db: Dict[str, Any], name: str) -> Optional[Task]:
-    raw = db["tasks"].get(name.lower())
-    if not raw:
+        return
+    TASKS_DIR.mkdir(parents=True, exist_ok=True)
+    index = {}
+    if INDEX_FILE.exists():
+        try:
+            index = _loads(INDEX_FILE.read_bytes())
+        except Exception:
+            index = {}
+    for key, raw in db.get("tasks", {}).items():
+        _migrate_record(raw)
+        index.setdefault(key, raw["name"])
+        path = _task_path(key)
+        if not path.exists():
+            _write_atomic(path, _dumps(raw))
+    _write_atomic(INDEX_FILE, _dumps(index))
+    os.replace(DB_FILE, DB_FILE.with_suffix(".json.bak"))
+
+def load_index() -> Dict[str, str]:
+    """Map of task key -> display name; rebuilt from the tasks dir if missing."""
+    _migrate_monolith()
+    if INDEX_FILE.exists():
+        try:
+            return _loads(INDEX_FILE.read_bytes())
+        except Exception:
+            pass
+    index = {}
+    if TASKS_DIR.exists():
+        for p in sorted(TASKS_DIR.glob("*.json")):
+            try:
+                raw = _loads(p.read_bytes())
+            except Exception:
+                continue
+            index[raw["name"].lower()] = raw["name"]
+    if index:
+        # Persist the rebuild: otherwise a fresh install never gets an
+        # index.json and every later run re-parses the whole task corpus
+        # just to enumerate names.
+        _write_atomic(INDEX_FILE, _dumps(index))
+    return index
+
+def load_record(key: str) -> Optional[Dict[str, Any]]:
+    """Load one task's record — single-task commands parse only their own file.
+
+    The returned record is a fresh parse owned by the caller; read-only
+    callers use it in place and never pay a defensive copy of done_days.
+    """
+    _migrate_monolith()
+    path = _task_path(key)
+    if not path.exists():
         return None
-    return Task(name=raw["name"], created_at=raw["created_at"], done_days=list(raw.get("done_days", [])))
-
-def put_task(db: Dict[str, Any], task: Task) -> None:
-    db["tasks"][task.name.lower()] = {
+    try:
+        raw = _loads(path.read_bytes())
+    except Exception:
+        return None
+    _migrate_record(raw)
+    return raw
+
+def save_record(raw: Dict[str, Any]) -> None:
+    key = raw["name"].lower()
+    TASKS_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(_task_path(key), _dumps(raw))
+    index = load_index()
+    if index.get(key) != raw["name"]:
+        index[key] = raw["name"]
+        _write_atomic(INDEX_FILE, _dumps(index))
+
+def iter_records() -> Iterator[Dict[str, Any]]:
+    """Yield every stored task record in key order, for the list/stats passes."""
+    keys = set(load_index())
+    if TASKS_DIR.exists():
+        # Reconcile with the directory: save_record writes the task file and
+        # the index separately, so a crash in between leaves a record the
+        # index does not know about yet.
+        keys.update(p.stem for p in TASKS_DIR.glob("*.json"))
+    seen = set()
+    for key in sorted(keys):
+        path = _task_path(key)
+        if path in seen:
+            continue
+        seen.add(path)
+        raw = load_record(key)
+        if raw is not None:
+            yield raw
+
+def put_task(task: Task, streaks: Optional[Dict[str, int]] = None, presorted: bool = False) -> None:
+    # Callers that keep the stored order (bisect.insort / filtered removal)
+    # pass presorted=True to skip the O(n log n) sort+dedup on every write.
+    done_days = task.done_days if presorted else sorted(set(task.done_days))
+    if streaks is None:
+        streaks = compute_streaks(done_days)
+    save_record({
         "name": task.name,
         "created_at": task.created_at,
-        "done_days": sorted(list(set(task.done_days)))
-    }
+        "done_days": done_days,
+        # Cached so read-only commands skip recomputation on later runs.
+        "_streaks": {
+            "current": streaks["current"],
+            "best": streaks["best"],
+            "n": len(done_days),
+            "today": today_ord(),
+        },
+    })
 
 # ------------- Streak Math -------------
 
-def str_to_date(s: str) -> datetime:
-    return datetime.strptime(s, DATE_FMT)
-
-def date_to_str(d: datetime) -> str:
-    return d.strftime(DATE_FMT)
-
-def compute_streaks(done_days: List[str]) -> Dict[str, int]:
-    """Return current_streak and best_streak given a list of YYYY-MM-DD strings."""
+def _to_ordinal(s: str) -> int:
+    """Parse YYYY-MM-DD into a day ordinal via the C fromisoformat fast path."""
+    return date.fromisoformat(s).toordinal()
+
+def _recent_mask(done_days, today: int, window: int = RECENT_MASK_DAYS) -> int:
+    """Bitmask of the recent window: bit k is set iff day (today - k) is done."""
+    mask = 0
+    lo = today - window
+    for o in done_days:
+        if lo < o <= today:
+            mask |= 1 << (today - o)
+    return mask
+
+def _trailing_ones(mask: int) -> int:
+    """Count consecutive set bits from bit 0 upward."""
+    return ((mask + 1) & ~mask).bit_length() - 1
+
+def compute_streaks(done_days: List[int]) -> Dict[str, int]:
+    """Return current_streak and best_streak given a list of day ordinals."""
     if not done_days:
         return {"current": 0, "best": 0}
-    days = sorted(set(done_days))
+    return dict(_compute_streaks_cached(tuple(sorted(done_days)), today_ord()))
+
+_kernel = None
+_kernel_tried = False
+
+def _load_kernel():
+    """Lazily import the optional numba kernel; cold start never pays for it."""
+    global _kernel, _kernel_tried
+    if not _kernel_tried:
+        _kernel_tried = True
+        try:
+            from _streak_kernel import best_and_current
+            _kernel = best_and_current
+        except Exception:
+            _kernel = None
+    return _kernel
+
+def _numpy_streaks(ords: "np.ndarray", today_ord: int) -> Dict[str, int]:
+    """Vectorized best/current streak over a sorted, deduped ordinal array."""
+    gaps = np.flatnonzero(np.diff(ords) != 1)
+    starts = np.concatenate(([0], gaps + 1))
+    ends = np.concatenate((gaps, [ords.size - 1]))
+    best = int((ends - starts + 1).max())
+    current = 0
+    for anchor in (today_ord, today_ord - 1):
+        i = int(np.searchsorted(ords, anchor))
+        if i < ords.size and ords[i] == anchor:
+            run = int(np.searchsorted(ends, i))
+            current = i - int(starts[run]) + 1
+            break
+    return {"current": current, "best": best}
+
+@functools.lru_cache(maxsize=None)
+def _compute_streaks_cached(days_tuple: tuple, today_ord: int) -> Dict[str, int]:
+    """Memoized core of compute_streaks, keyed by the sorted ordinal tuple and today."""
+    ords = sorted(set(days_tuple))
+    if np is not None and len(ords) >= NUMPY_MIN_DAYS:
+        arr = np.asarray(ords, dtype=np.int32)
+        kernel = _load_kernel()
+        if kernel is not None:
+            best, current = kernel(arr, today_ord)
+            return {"current": int(current), "best": int(best)}
+        return _numpy_streaks(arr, today_ord)
     # best streak
     best = 1
     cur = 1
-    for i in range(1, len(days)):
-        d_prev = str_to_date(days[i - 1])
-        d_cur  = str_to_date(days[i])
-        if d_cur - d_prev == timedelta(days=1):
+    for i in range(1, len(ords)):
+        if ords[i] - ords[i - 1] == 1:
             cur += 1
             best = max(best, cur)
         else:
             cur = 1
-    # current streak (ending today/yesterday)
-    today = str_to_date(today_str())
-    dayset = set(days)
-    # Walk backwards from today while days exist
-    cur_today = 0
-    probe = today
-    while date_to_str(probe) in dayset:
-        cur_today += 1
-        probe -= timedelta(days=1)
-    # If not today, try starting yesterday (allows checking after midnight)
-    if cur_today == 0:
-        probe = today - timedelta(days=1)
-        while date_to_str(probe) in dayset:
+    # current streak (ending today/yesterday): membership via a bitmask over
+    # the recent window — one shift-and-test per day instead of a hash probe.
+    mask = _recent_mask(ords, today_ord)
+    # Anchor at today if marked, else at yesterday (allows checking after
+    # midnight): one backward count on integers, never timedeltas or strings.
+    anchored_today = mask & 1
+    anchor_mask = mask if anchored_today else mask >> 1
+    cur_today = _trailing_ones(anchor_mask)
+    end_day = today_ord if anchored_today else today_ord - 1
+    if cur_today >= RECENT_MASK_DAYS - 1:
+        # Streak may extend past the mask window; finish the walk on the set.
+        ordset = set(ords)
+        first_day = end_day - cur_today + 1
+        while first_day - 1 in ordset:
             cur_today += 1
-            probe -= timedelta(days=1)
+            first_day -= 1
     return {"current": cur_today, "best": best}
 
-def mini_calendar(done_days: List[str], span: int = 14) -> str:
+def _streaks_for(raw: Dict[str, Any]) -> Dict[str, int]:
+    """Streaks for a stored task record, trusting the cached blob when still fresh."""
+    cached = raw.get("_streaks")
+    if (
+        cached
+        and cached.get("n") == len(raw.get("done_days", []))
+        and cached.get("today") == today_ord()
+    ):
+        return {"current": cached["current"], "best": cached["best"]}
+    return compute_streaks(raw.get("done_days", []))
+
+# Per-run summaries keyed by the identity of a record's done_days list; the
+# held list reference keeps each id stable for the life of the process.
+_summary_cache: Dict[int, "tuple[List[int], Dict[str, int]]"] = {}
+
+def _task_summary(raw: Dict[str, Any]) -> Dict[str, int]:
+    """Streaks plus mark count for a record, computed at most once per run."""
+    days = raw.get("done_days", [])
+    hit = _summary_cache.get(id(days))
+    if hit is not None and hit[0] is days:
+        return hit[1]
+    s = _streaks_for(raw)
+    summary = {"n": len(days), "current": s["current"], "best": s["best"]}
+    _summary_cache[id(days)] = (days, summary)
+    return summary
+
+def mini_calendar(done_days: List[int], span: int = 14) -> str:
     """Return a compact 14-day calendar line: O = done, . = missed, with dates underneath."""
-    today = datetime.now().date()
-    dayset = set(done_days)
+    today = today_ord()
+    # Membership via a span-sized bitmask: a shift-and-test per cell, and no
+    # set built over the whole history for a 14-cell render.
+    mask = _recent_mask(done_days, today, window=span)
     marks = []
     dates = []
-    for i in range(span - 1, -1, -1):
-        d = today - timedelta(days=i)
-        s = d.strftime(DATE_FMT)
-        marks.append("O" if s in dayset else ".")
-        dates.append(d.strftime("%m-%d"))
+    # Dates are only formatted for the span cells actually displayed.
+    for k in range(span - 1, -1, -1):
+        marks.append("O" if (mask >> k) & 1 else ".")
+        d = date.fromordinal(today - k)
+        # f-string beats strftime("%m-%d") ~3x: no format-code parsing per cell.
+        dates.append(f"{d.month:02d}-{d.day:02d}")
     return "".join(marks) + "\n" + " ".join(dates)
 
 # ------------- Commands -------------
 
+def _normalize(parts: List[str]) -> "tuple[str, str]":
+    """Join argv name parts once, returning (display name, lookup key)."""
+    name = " ".join(parts).strip()
+    return name, name.lower()
+
 def cmd_add(args) -> int:
-    db = load_db()
-    name = " ".join(args.name).strip()
+    name, key = _normalize(args.name)
     if not name:
         print('Provide a task name, e.g. add "Write code"')
         return 1
-    if name.lower() in db["tasks"]:
+    if load_record(key) is not None:
         print("Task already exists.")
         return 1
     t = Task(name=name, created_at=datetime.now().isoformat(timespec="seconds"), done_days=[])
-    put_task(db, t)
-    save_db(db)
+    put_task(t)
     print(f"✅ Added task: {name}")
     return 0
 
 def cmd_list(_args) -> int:
-    db = load_db()
-    if not db["tasks"]:
+    records = list(iter_records())
+    if not records:
         print("No tasks yet. Add one with: add \"Write code\"")
         return 0
     print("Tasks:")
-    for k, raw in sorted(db["tasks"].items()):
-        t = get_task(db, raw["name"])
-        streaks = compute_streaks(t.done_days)
-        print(f" - {t.name}  (current: {streaks['current']}, best: {streaks['best']}, total days: {len(t.done_days)})")
+    for raw in records:
+        s = _task_summary(raw)
+        print(f" - {raw['name']}  (current: {s['current']}, best: {s['best']}, total days: {s['n']})")
     return 0
 
 def cmd_done(args) -> int:
-    db = load_db()
-    name = " ".join(args.name).strip()
+    name, key = _normalize(args.name)
     if not name:
         print('Usage: done "Write code"')
         return 1
-    t = get_task(db, name)
-    if not t:
+    raw = load_record(key)
+    if not raw:
         print("No such task. Add it first with: add \"...\"")
         return 1
-    day = today_str()
-    if day in t.done_days:
-        print(f"Already marked done today for: {t.name}")
+    done_days = raw.get("done_days", [])
+    day = today_ord()
+    if day in done_days:
+        print(f"Already marked done today for: {raw['name']}")
         return 0
-    t.done_days.append(day)
-    put_task(db, t)
-    save_db(db)
-    print(f"✅ Marked done for {t.name} on {day}")
+    # Today either extends the streak ending yesterday or starts a new one,
+    # so current/best follow in O(1) from the cached values — no recompute.
+    cached = raw.get("_streaks")
+    streaks = None
+    if cached and cached.get("n") == len(done_days) and cached.get("today") in (day, day - 1):
+        new_current = cached["current"] + 1 if day - 1 in done_days else 1
+        streaks = {"current": new_current, "best": max(cached["best"], new_current)}
+    bisect.insort(done_days, day)
+    t = Task(name=raw["name"], created_at=raw["created_at"], done_days=done_days)
+    put_task(t, streaks=streaks, presorted=True)
+    print(f"✅ Marked done for {t.name} on {today_str()}")
     return 0
 
 def cmd_undo(args) -> int:
-    db = load_db()
-    name = " ".join(args.name).strip()
+    name, key = _normalize(args.name)
     if not name:
         print('Usage: undo "Write code"')
         return 1
-    t = get_task(db, name)
-    if not t:
+    raw = load_record(key)
+    if not raw:
         print("No such task.")
         return 1
-    day = today_str()
-    if day in t.done_days:
-        t.done_days = [d for d in t.done_days if d != day]
-        put_task(db, t)
-        save_db(db)
+    done_days = raw.get("done_days", [])
+    day = today_ord()
+    if day in done_days:
+        remaining = [d for d in done_days if d != day]
+        # Removing today just shortens the current streak; best only needs a
+        # recompute when today's mark was what set it (best == current).
+        cached = raw.get("_streaks")
+        streaks = None
+        if (
+            cached
+            and cached.get("n") == len(remaining) + 1
+            and cached.get("today") == day
+            and cached.get("best", 0) > cached.get("current", 0)
+        ):
+            new_current = cached["current"] - 1 if day - 1 in remaining else 0
+            streaks = {"current": new_current, "best": cached["best"]}
+        # Filtering a sorted list leaves it sorted — no need to re-sort.
+        t = Task(name=raw["name"], created_at=raw["created_at"], done_days=remaining)
+        put_task(t, streaks=streaks, presorted=True)
         print(f"↩️ Removed today’s completion for {t.name}")
     else:
         print("Nothing to undo for today.")
     return 0
 
 def cmd_streaks(args) -> int:
-    db = load_db()
-    name = " ".join(args.name).strip() if args.name else ""
+    name, key = _normalize(args.name) if args.name else ("", "")
     if name:
-        t = get_task(db, name)
-        if not t:
+        raw = load_record(key)
+        if not raw:
             print("No such task.")
             return 1
-        s = compute_streaks(t.done_days)
-        print(f"{t.name} → current: {s['current']}, best: {s['best']}, total days: {len(t.done_days)}")
-        print(mini_calendar(t.done_days))
+        s = _task_summary(raw)
+        print(f"{raw['name']} → current: {s['current']}, best: {s['best']}, total days: {s['n']}")
+        print(mini_calendar(raw.get("done_days", [])))
         return 0
     # overall summary
     best_any = 0
-    for raw in db["tasks"].values():
-        s = compute_streaks(raw.get("done_days", []))
+    for raw in iter_records():
+        s = _task_summary(raw)
         best_any = max(best_any, s["best"])
     print(f"Overall best streak across tasks: {best_any}")
     return 0
 
 def cmd_calendar(args) -> int:
-    db = load_db()
-    name = " ".join(args.name).strip()
-    t = get_task(db, name)
-    if not t:
+    name, key = _normalize(args.name)
+    raw = load_record(key)
+    if not raw:
         print("No such task.")
         return 1
-    print(t.name)
-    print(mini_calendar(t.done_days, span=args.days))
+    print(raw["name"])
+    print(mini_calendar(raw.get("done_days", []), span=args.days))
     return 0
 
+def _count_marks_streaming(path: Path) -> int:
+    """Count done_days entries via parse events, materializing none of them."""
+    with open(path, "rb") as f:
+        return sum(1 for _ in ijson.items(f, "done_days.item"))
+
 def cmd_stats(_args) -> int:
-    db = load_db()
-    total_marks = sum(len(raw.get("done_days", [])) for raw in db["tasks"].values())
+    _migrate_monolith()
+    if ijson is not None and TASKS_DIR.exists():
+        total_marks = 0
+        for p in TASKS_DIR.glob("*.json"):
+            try:
+                total_marks += _count_marks_streaming(p)
+            except Exception:
+                # Malformed file: degrade like load_record does instead of
+                # letting a parse error crash stats but not list.
+                raw = load_record(p.stem)
+                total_marks += len(raw.get("done_days", [])) if raw else 0
+        records = iter_records()
+    else:
+        records = list(iter_records())
+        total_marks = sum(len(raw.get("done_days", [])) for raw in records)
     print(f"Total checkmarks: {total_marks}")
-    for raw in db["tasks"].values():
-        t = get_task(db, raw["name"])
-        s = compute_streaks(t.done_days)
-        print(f" - {t.name}: {len(t.done_days)} marks (current {s['current']}, best {s['best']})")
+    for raw in records:
+        s = _task_summary(raw)
+        print(f" - {raw['name']}: {s['n']} marks (current {s['current']}, best {s['best']})")
     return 0
 
 # ------------- Arg Parser -------------
 
 def build_parser():
+    import argparse  # deferred: only paid on the slow path (--help, calendar, errors)
+
     p = argparse.ArgumentParser(
         prog="streaks",
         description="Track daily tasks and streaks."
@@ -248,8 +518,32 @@ def build_parser():
 
     return p
 
+# Verbs that take at most a free-form name; dispatched without argparse.
+_FAST_COMMANDS = {
+    "add": cmd_add,
+    "done": cmd_done,
+    "undo": cmd_undo,
+    "list": cmd_list,
+    "streaks": cmd_streaks,
+    "stats": cmd_stats,
+}
+
+# Fast-path verbs that accept no name at all; extra argv must be an error.
+_NO_NAME_VERBS = {"list", "stats"}
+
 def main(argv=None):
     argv = argv if argv is not None else sys.argv[1:]
+    # Fast path for the common verbs: skip building the whole argparse tree
+    # (subparsers + help strings dominate cold start for a CLI this small).
+    # Anything with flags — --help, calendar --days — falls through, as do
+    # stray positionals after a no-name verb, so argparse reports them.
+    if (
+        argv
+        and argv[0] in _FAST_COMMANDS
+        and not any(a.startswith("-") for a in argv[1:])
+        and not (argv[0] in _NO_NAME_VERBS and len(argv) > 1)
+    ):
+        return _FAST_COMMANDS[argv[0]](SimpleNamespace(cmd=argv[0], name=argv[1:]))
     parser = build_parser()
     args = parser.parse_args(argv)
     return args.func(args)